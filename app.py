@@ -4,101 +4,270 @@ BTC Trading Platform - PVP Long/Short Game
 Website dengan harga BTC real-time dari Binance dan fitur trading PVP
 """
 
+import asyncio
+import os
 import requests
 import json
 import time
-import random
 import threading
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, Response
+from flask.json.provider import DefaultJSONProvider
+import orjson
+import redis
+from requests.adapters import HTTPAdapter
 import sqlite3
 from werkzeug.security import generate_password_hash, check_password_hash
 
+try:
+    import gevent
+    import gevent.monkey
+except ImportError:  # plain dev server without gevent installed
+    gevent = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Serialize jsonify() responses with orjson instead of the stdlib json"""
+    def dumps(self, obj, **kwargs):
+        # Keep Flask's fallback for Decimal, dates, __html__ objects, etc.
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        # Callers such as the session serializer may pass object_hook
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.secret_key = 'your-secret-key-here'
 app.config['DATABASE'] = 'trading_game.db'
+app.config['REDIS_URL'] = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+# Cheaper than Werkzeug's default hash; existing hashes still verify
+app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:50000'
+
+# Shared BTC price cache, read by every worker and written by one refresher
+PRICE_KEY = 'btc:price'
+PRICE_REFRESH_INTERVAL = 1  # seconds between Binance polls
+BINANCE_TIMEOUT = 1  # seconds, applied to connect and read separately
+# The key must outlive a failed poll (up to connect + read timeout) plus the
+# sleep after it, or readers see it expire while the last good price is resent
+PRICE_TTL = 2 * BINANCE_TIMEOUT + PRICE_REFRESH_INTERVAL + 1  # seconds
+# Past this age the last good price is dropped, so trading stops rather than
+# settling at a stale price during a long Binance outage
+MAX_PRICE_AGE = 5 * PRICE_TTL  # seconds
+
+r = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(
+    app.config['REDIS_URL'], max_connections=16))
+
+# Keep-alive session so Binance polls reuse one TCP+TLS connection
+SESSION = requests.Session()
+SESSION.headers['Connection'] = 'keep-alive'
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 # Initialize database
 def init_db():
     with sqlite3.connect(app.config['DATABASE']) as conn:
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                balance REAL DEFAULT 10000.0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                type TEXT NOT NULL,
-                amount REAL NOT NULL,
-                entry_price REAL NOT NULL,
-                leverage INTEGER DEFAULT 1,
-                fee REAL DEFAULT 0.001,
-                pnl REAL DEFAULT 0,
-                status TEXT DEFAULT 'open',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                closed_at DATETIME,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS deposits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                amount REAL NOT NULL,
-                status TEXT DEFAULT 'pending',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
+        # Each block migrates to, and stamps, its own version; add an
+        # `if version < 2:` block after this one for the next schema change
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            # WAL lets readers keep going while a writer commits (persists in the file)
+            conn.execute('PRAGMA journal_mode = WAL')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    balance REAL DEFAULT 10000.0,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    type TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    entry_price REAL NOT NULL,
+                    leverage INTEGER DEFAULT 1,
+                    fee REAL DEFAULT 0.001,
+                    pnl REAL DEFAULT 0,
+                    status TEXT DEFAULT 'open',
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    closed_at DATETIME,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+            
+            # Serves the dashboard's open-trades lookup without a scan or sort
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS ix_trades_user_status_time
+                ON trades (user_id, status, created_at DESC)
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS deposits (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    amount REAL NOT NULL,
+                    status TEXT DEFAULT 'pending',
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+            
+            conn.execute('ANALYZE')
+            conn.execute('PRAGMA user_version = 1')
 
 def get_db():
-    conn = sqlite3.connect(app.config['DATABASE'])
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return this app context's database connection, opening it on first use"""
+    db = getattr(g, '_db', None)
+    if db is None:
+        db = g._db = sqlite3.connect(app.config['DATABASE'], check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        # sqlite3 is not gevent-aware: under the Procfile's gevent workers this
+        # wait (and every query) blocks all greenlets in the worker, SSE included
+        db.execute('PRAGMA busy_timeout = 5000')
+        # Safe with WAL and saves an fsync per commit
+        db.execute('PRAGMA synchronous = NORMAL')
+    return db
+
+@app.teardown_appcontext
+def close_db(exception):
+    db = g.pop('_db', None)
+    if db is not None:
+        db.close()
+
+def run_blocking(func, *args, **kwargs):
+    """Run CPU-heavy work (password hashing) without stalling a gevent worker"""
+    if gevent is not None and gevent.monkey.is_module_patched('threading'):
+        # Real OS thread; hashlib drops the GIL so other greenlets keep running
+        return gevent.get_hub().threadpool.apply(func, args, kwargs)
+    return func(*args, **kwargs)
+
+# SQL statements, kept as constants so every call hits sqlite3's statement cache
+SQL_GET_LOGIN = 'SELECT id, password FROM users WHERE username = ?'
+SQL_INSERT_USER = 'INSERT INTO users (username, password) VALUES (?, ?)'
+SQL_CREDIT_BALANCE = 'UPDATE users SET balance = balance + ? WHERE id = ?'
+SQL_DEBIT_BALANCE = 'UPDATE users SET balance = balance - ? WHERE id = ? AND balance >= ?'
+SQL_INSERT_DEPOSIT = "INSERT INTO deposits (user_id, amount, status) VALUES (?, ?, 'completed')"
+SQL_INSERT_TRADE = '''INSERT INTO trades (user_id, type, amount, entry_price, leverage, fee)
+VALUES (?, ?, ?, ?, ?, ?)'''
+SQL_GET_TRADE = ("SELECT type, amount, entry_price, leverage, fee FROM trades"
+                 " WHERE id = ? AND user_id = ? AND status = 'open'")
+SQL_CLOSE_TRADE = '''UPDATE trades SET status = 'closed', pnl = ?, closed_at = CURRENT_TIMESTAMP
+WHERE id = ?'''
+# User plus one row per open trade (trade columns NULL if there are none; the
+# trade id is aliased trade_id so `id` stays the user's), with
+# P&L per trade computed by the same formula as TradingEngine.calculate_pnl
+SQL_DASHBOARD = '''SELECT u.id, u.username, u.balance,
+t.id AS trade_id, t.type, t.amount, t.entry_price, t.leverage,
+CASE WHEN t.type = 'long' THEN (:price - t.entry_price) ELSE (t.entry_price - :price) END
+* t.amount * t.leverage - t.entry_price * t.amount * t.fee AS current_pnl
+FROM users u LEFT JOIN trades t ON t.user_id = u.id AND t.status = 'open'
+WHERE u.id = :user_id ORDER BY t.created_at DESC'''
+
+class PriceUnavailable(Exception):
+    """No fresh enough BTC price is known (or the refresher has stopped)"""
+
+# Last good Binance price and when it was fetched (time.monotonic()),
+# served again when a poll fails until it is older than MAX_PRICE_AGE
+_last_price = None
+_last_price_at = 0.0
 
 def get_btc_price():
-    """Get real-time BTC price from Binance"""
+    """Get real-time BTC price from Binance, or the last good one if it fails"""
+    global _last_price, _last_price_at
     try:
         url = "https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT"
-        response = requests.get(url, timeout=5)
+        response = SESSION.get(url, timeout=BINANCE_TIMEOUT)
         data = response.json()
-        return float(data['price'])
-    except:
-        # Fallback to random price if API fails
-        return round(random.uniform(30000, 60000), 2)
+        _last_price = float(data['price'])
+        _last_price_at = time.monotonic()
+    except (requests.RequestException, KeyError, ValueError) as e:
+        if _last_price is None or time.monotonic() - _last_price_at > MAX_PRICE_AGE:
+            raise PriceUnavailable('Could not fetch BTC price from Binance') from e
+    return _last_price
 
 class TradingEngine:
     def __init__(self):
-        self.btc_price = get_btc_price()
-        self.update_price()
-        
-    def update_price(self):
-        """Update BTC price every 10 seconds"""
-        self.btc_price = get_btc_price()
-        threading.Timer(10.0, self.update_price).start()
+        # (price, encoded /get_price body), swapped as one tuple so reads stay consistent
+        self._price_json = (None, b'')
+    
+    @property
+    def btc_price(self):
+        """Latest BTC price from the shared Redis cache"""
+        price = r.get(PRICE_KEY)
+        if price is None:
+            raise PriceUnavailable('BTC price unavailable')
+        return float(price)
+
+    @btc_price.setter
+    def btc_price(self, price):
+        r.set(PRICE_KEY, price, ex=PRICE_TTL)
+
+    def price_json(self):
+        """JSON body for /get_price, re-encoded only when the price changes"""
+        price = self.btc_price
+        cached_price, body = self._price_json
+        if price != cached_price:
+            body = orjson.dumps({'price': price})
+            self._price_json = (price, body)
+        return body
+
+    async def price_loop(self):
+        """Keep the cached BTC price fresh, forever"""
+        while True:
+            try:
+                self.btc_price = await asyncio.to_thread(get_btc_price)
+            except Exception:
+                # Binance or Redis hiccup: log it and try again next tick
+                app.logger.exception('BTC price refresh failed')
+            await asyncio.sleep(PRICE_REFRESH_INTERVAL)
+
+    def start_price_refresher(self):
+        """Run price_loop on its own event loop in one daemon thread"""
+        threading.Thread(target=lambda: asyncio.run(self.price_loop()),
+                         daemon=True).start()
         
     def calculate_pnl(self, trade, current_price):
-        """Calculate P&L for a trade"""
-        if trade['type'] == 'long':
-            pnl = (current_price - trade['entry_price']) * trade['amount'] * trade['leverage']
-        else:  # short
-            pnl = (trade['entry_price'] - current_price) * trade['amount'] * trade['leverage']
+        """Calculate P&L for a trade (unrounded; format when rendering)"""
+        sign = 1.0 if trade['type'] == 'long' else -1.0  # short
+        entry_price, amount = trade['entry_price'], trade['amount']
+        pnl = sign * (current_price - entry_price) * amount * trade['leverage']
         
         # Apply fee
-        pnl -= trade['entry_price'] * trade['amount'] * trade['fee']
-        return round(pnl, 2)
+        return pnl - entry_price * amount * trade['fee']
 
 # Initialize trading engine
 trading_engine = TradingEngine()
 
+# Only one process should poll Binance; every other worker just reads Redis
+if __name__ == '__main__':
+    # The debug reloader runs this script twice; only the serving child polls
+    run_refresher = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+else:
+    run_refresher = bool(os.environ.get('PRICE_REFRESHER'))
+
+if run_refresher:
+    trading_engine.start_price_refresher()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database tables and indexes"""
+    init_db()
+
+@app.cli.command('price-refresher')
+def price_refresher():
+    """Poll Binance and publish the BTC price to Redis"""
+    asyncio.run(trading_engine.price_loop())
+
+@app.errorhandler(PriceUnavailable)
+def price_unavailable(error):
+    return jsonify({'error': str(error)}), 503
+
 # Routes
 @app.route('/')
 def index():
@@ -106,25 +275,22 @@ def index():
         return redirect(url_for('login'))
     
     user_id = session['user_id']
+    btc_price = trading_engine.btc_price
     db = get_db()
     
-    user = db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-    open_trades = db.execute('''
-        SELECT * FROM trades 
-        WHERE user_id = ? AND status = 'open'
-        ORDER BY created_at DESC
-    ''', (user_id,)).fetchall()
+    # One round trip for the user, their open trades and each trade's P&L
+    rows = db.execute(SQL_DASHBOARD, {'price': btc_price, 'user_id': user_id}).fetchall()
+    if not rows:
+        session.pop('user_id', None)
+        return redirect(url_for('login'))
     
-    # Calculate total P&L for open trades
-    total_pnl = 0
-    for trade in open_trades:
-        trade_dict = dict(trade)
-        trade_dict['current_pnl'] = trading_engine.calculate_pnl(trade_dict, trading_engine.btc_price)
-        total_pnl += trade_dict['current_pnl']
+    user = rows[0]
+    open_trades = [row for row in rows if row['trade_id'] is not None]
+    total_pnl = sum(trade['current_pnl'] for trade in open_trades)
     
     return render_template('index.html', 
                          user=user, 
-                         btc_price=trading_engine.btc_price,
+                         btc_price=btc_price,
                          open_trades=open_trades,
                          total_pnl=total_pnl)
 
@@ -135,9 +301,9 @@ def login():
         password = request.form['password']
         
         db = get_db()
-        user = db.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
+        user = db.execute(SQL_GET_LOGIN, (username,)).fetchone()
         
-        if user and check_password_hash(user['password'], password):
+        if user and run_blocking(check_password_hash, user['password'], password):
             session['user_id'] = user['id']
             return redirect(url_for('index'))
         
@@ -151,10 +317,12 @@ def register():
         username = request.form['username']
         password = request.form['password']
         
+        password_hash = run_blocking(generate_password_hash, password,
+                                     method=app.config['PASSWORD_HASH_METHOD'])
+        
         db = get_db()
         try:
-            db.execute('INSERT INTO users (username, password) VALUES (?, ?)',
-                     (username, generate_password_hash(password)))
+            db.execute(SQL_INSERT_USER, (username, password_hash))
             db.commit()
             return redirect(url_for('login'))
         except sqlite3.IntegrityError:
@@ -171,10 +339,10 @@ def deposit():
     user_id = session['user_id']
     
     db = get_db()
-    db.execute('UPDATE users SET balance = balance + ? WHERE id = ?', (amount, user_id))
-    db.execute('INSERT INTO deposits (user_id, amount, status) VALUES (?, ?, "completed")',
-             (user_id, amount))
-    db.commit()
+    with db:
+        db.execute('BEGIN IMMEDIATE')
+        db.execute(SQL_CREDIT_BALANCE, (amount, user_id))
+        db.execute(SQL_INSERT_DEPOSIT, (user_id, amount))
     
     return redirect(url_for('index'))
 
@@ -187,28 +355,23 @@ def trade():
     trade_type = request.form['type']
     amount = float(request.form['amount'])
     leverage = int(request.form.get('leverage', 1))
+    btc_price = trading_engine.btc_price
     
-    db = get_db()
-    user = db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-    
-    # Calculate required margin
-    required_margin = trading_engine.btc_price * amount * leverage * 0.01  # 1% margin
-    
-    if user['balance'] < required_margin:
-        return jsonify({'error': 'Insufficient balance'}), 400
-    
-    # Execute trade
-    fee = trading_engine.btc_price * amount * 0.001  # 0.1% fee
-    db.execute('''
-        INSERT INTO trades (user_id, type, amount, entry_price, leverage, fee)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (user_id, trade_type, amount, trading_engine.btc_price, leverage, fee))
-    
-    # Update balance
-    db.execute('UPDATE users SET balance = balance - ? WHERE id = ?',
-             (required_margin + fee, user_id))
+    # Calculate required margin and fee
+    required_margin = btc_price * amount * leverage * 0.01  # 1% margin
+    fee = btc_price * amount * 0.001  # 0.1% fee
+    cost = required_margin + fee
     
-    db.commit()
+    db = get_db()
+    with db:
+        db.execute('BEGIN IMMEDIATE')
+        # Debit only if the balance covers it, atomically under the write lock
+        cur = db.execute(SQL_DEBIT_BALANCE, (cost, user_id, cost))
+        if cur.rowcount == 0:
+            return jsonify({'error': 'Insufficient balance'}), 400
+        
+        # Execute trade
+        db.execute(SQL_INSERT_TRADE, (user_id, trade_type, amount, btc_price, leverage, fee))
     
     return jsonify({'success': True})
 
@@ -218,500 +381,51 @@ def close_trade(trade_id):
         return redirect(url_for('login'))
     
     user_id = session['user_id']
+    btc_price = trading_engine.btc_price
     db = get_db()
     
-    trade = db.execute('SELECT * FROM trades WHERE id = ? AND user_id = ?',
-                     (trade_id, user_id)).fetchone()
-    
-    if trade:
-        pnl = trading_engine.calculate_pnl(dict(trade), trading_engine.btc_price)
-        
-        db.execute('''
-            UPDATE trades 
-            SET status = 'closed', pnl = ?, closed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (pnl, trade_id))
+    with db:
+        # Take the write lock before reading so a trade can only be closed once
+        db.execute('BEGIN IMMEDIATE')
+        trade = db.execute(SQL_GET_TRADE, (trade_id, user_id)).fetchone()
         
-        # Update user balance
-        db.execute('UPDATE users SET balance = balance + ? WHERE id = ?',
-                 (pnl, user_id))
-        
-        db.commit()
+        if trade:
+            pnl = trading_engine.calculate_pnl(trade, btc_price)
+            
+            db.execute(SQL_CLOSE_TRADE, (pnl, trade_id))
+            
+            # Update user balance
+            db.execute(SQL_CREDIT_BALANCE, (pnl, user_id))
     
     return redirect(url_for('index'))
 
+@app.route('/logout')
+def logout():
+    session.pop('user_id', None)
+    return redirect(url_for('login'))
+
 @app.route('/get_price')
 def get_price():
-    return jsonify({'price': trading_engine.btc_price})
+    return Response(trading_engine.price_json(), mimetype='application/json')
 
-# HTML Templates
-@app.route('/templates/<template_name>')
-def serve_template(template_name):
-    return render_template(template_name)
+@app.route('/sse/price')
+def price_stream():
+    """Push the BTC price to the browser as Server-Sent Events when it changes"""
+    def generate():
+        last_price = None
+        while True:
+            try:
+                price = trading_engine.btc_price
+            except PriceUnavailable:
+                price = last_price
+            if price != last_price:
+                yield f'data: {price}\n\n'
+                last_price = price
+            time.sleep(PRICE_REFRESH_INTERVAL)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
 
 if __name__ == '__main__':
     init_db()
-    app.run(debug=True, port=5000)
-
-# Create templates directory and files
-import os
-os.makedirs('templates', exist_ok=True)
-
-# Index HTML
-with open('templates/index.html', 'w', encoding='utf-8') as f:
-    f.write('''<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>BTC Trading PVP</title>
-    <style>
-        :root {
-            --primary: #2563eb;
-            --success: #10b981;
-            --danger: #ef4444;
-            --dark: #1f2937;
-            --light: #f3f4f6;
-        }
-        
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        }
-        
-        body {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-            color: #333;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            overflow: hidden;
-        }
-        
-        .header {
-            background: var(--dark);
-            color: white;
-            padding: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .price-ticker {
-            background: var(--primary);
-            color: white;
-            padding: 10px 20px;
-            text-align: center;
-            font-size: 1.2em;
-            font-weight: bold;
-        }
-        
-        .dashboard {
-            padding: 20px;
-            display: grid;
-            grid-template-columns: 1fr 2fr;
-            gap: 20px;
-        }
-        
-        .card {
-            background: var(--light);
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .balance {
-            font-size: 2em;
-            font-weight: bold;
-            color: var(--primary);
-        }
-        
-        .trade-form {
-            display: grid;
-            gap: 10px;
-            margin-top: 20px;
-        }
-        
-        input, select, button {
-            padding: 12px;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            font-size: 1em;
-        }
-        
-        button {
-            background: var(--primary);
-            color: white;
-            border: none;
-            cursor: pointer;
-            font-weight: bold;
-        }
-        
-        .btn-long { background: var(--success); }
-        .btn-short { background: var(--danger); }
-        
-        .trades-list {
-            margin-top: 20px;
-        }
-        
-        .trade-item {
-            padding: 15px;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            margin-bottom: 10px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .trade-long { border-left: 4px solid var(--success); }
-        .trade-short { border-left: 4px solid var(--danger); }
-        
-        .profit { color: var(--success); }
-        .loss { color: var(--danger); }
-        
-        .nav { display: flex; gap: 15px; }
-        .nav a {
-            color: white;
-            text-decoration: none;
-            padding: 10px 15px;
-            border-radius: 5px;
-            transition: background 0.3s;
-        }
-        .nav a:hover { background: rgba(255,255,255,0.1); }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎯 BTC Trading PVP</h1>
-            <div class="nav">
-                <a href="{{ url_for('index') }}">Dashboard</a>
-                <a href="{{ url_for('logout') }}">Logout</a>
-            </div>
-        </div>
-        
-        <div class="price-ticker">
-            🚀 BTC Price: $<span id="btc-price">{{ "%.2f"|format(btc_price) }}</span>
-        </div>
-        
-        <div class="dashboard">
-            <div class="sidebar">
-                <div class="card">
-                    <h3>💰 Balance</h3>
-                    <div class="balance">${{ "%.2f"|format(user.balance) }}</div>
-                    
-                    <div class="trade-form">
-                        <h4>➕ Deposit</h4>
-                        <form action="{{ url_for('deposit') }}" method="POST">
-                            <input type="number" name="amount" placeholder="Amount" step="0.01" min="1" required>
-                            <button type="submit">Deposit</button>
-                        </form>
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <h3>🎯 New Trade</h3>
-                    <form class="trade-form" onsubmit="placeTrade(event)">
-                        <select name="type" required>
-                            <option value="long">LONG 🟢</option>
-                            <option value="short">SHORT 🔴</option>
-                        </select>
-                        <input type="number" name="amount" placeholder="BTC Amount" step="0.001" min="0.001" required>
-                        <select name="leverage">
-                            <option value="1">1x Leverage</option>
-                            <option value="5">5x Leverage</option>
-                            <option value="10">10x Leverage</option>
-                            <option value="25">25x Leverage</option>
-                        </select>
-                        <button type="submit" class="btn-long">Place Trade</button>
-                    </form>
-                </div>
-            </div>
-            
-            <div class="main-content">
-                <div class="card">
-                    <h3>📊 Open Trades</h3>
-                    <div class="trades-list">
-                        {% for trade in open_trades %}
-                        <div class="trade-item trade-{{ trade.type }}">
-                            <div>
-                                <strong>{{ trade.type|upper }} {{ trade.leverage }}x</strong><br>
-                                Amount: {{ trade.amount }} BTC<br>
-                                Entry: ${{ "%.2f"|format(trade.entry_price) }}
-                            </div>
-                            <div>
-                                <span class="{% if trade.current_pnl >= 0 %}profit{% else %}loss{% endif %}">
-                                    P&L: ${{ "%.2f"|format(trade.current_pnl) }}
-                                </span><br>
-                                <a href="{{ url_for('close_trade', trade_id=trade.id) }}" 
-                                   class="btn-{{ 'short' if trade.type == 'long' else 'long' }}">
-                                   Close Trade
-                                </a>
-                            </div>
-                        </div>
-                        {% else %}
-                        <p>No open trades</p>
-                        {% endfor %}
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <h3>📈 Total P&L: 
-                        <span class="{% if total_pnl >= 0 %}profit{% else %}loss{% endif %}">
-                            ${{ "%.2f"|format(total_pnl) }}
-                        </span>
-                    </h3>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // Update BTC price every 5 seconds
-        function updatePrice() {
-            fetch('/get_price')
-                .then(response => response.json())
-                .then(data => {
-                    document.getElementById('btc-price').textContent = data.price.toFixed(2);
-                });
-        }
-        
-        setInterval(updatePrice, 5000);
-        
-        // Place trade with AJAX
-        function placeTrade(event) {
-            event.preventDefault();
-            const formData = new FormData(event.target);
-            
-            fetch('/trade', {
-                method: 'POST',
-                body: formData
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.error) {
-                    alert('Error: ' + data.error);
-                } else {
-                    alert('Trade placed successfully!');
-                    window.location.reload();
-                }
-            });
-        }
-    </script>
-</body>
-</html>''')
-
-# Login HTML
-with open('templates/login.html', 'w', encoding='utf-8') as f:
-    f.write('''<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Login - BTC Trading</title>
-    <style>
-        body {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        }
-        
-        .login-container {
-            background: white;
-            padding: 40px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            width: 100%;
-            max-width: 400px;
-        }
-        
-        h1 {
-            text-align: center;
-            color: #333;
-            margin-bottom: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            font-size: 1em;
-        }
-        
-        button {
-            width: 100%;
-            padding: 12px;
-            background: #2563eb;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            font-size: 1.1em;
-            font-weight: bold;
-            cursor: pointer;
-        }
-        
-        .error {
-            color: #ef4444;
-            text-align: center;
-            margin-bottom: 15px;
-        }
-        
-        .register-link {
-            text-align: center;
-            margin-top: 20px;
-        }
-    </style>
-</head>
-<body>
-    <div class="login-container">
-        <h1>🚀 BTC Trading PVP</h1>
-        
-        {% if error %}
-        <div class="error">{{ error }}</div>
-        {% endif %}
-        
-        <form method="POST">
-            <div class="form-group">
-                <input type="text" name="username" placeholder="Username" required>
-            </div>
-            <div class="form-group">
-                <input type="password" name="password" placeholder="Password" required>
-            </div>
-            <button type="submit">Login</button>
-        </form>
-        
-        <div class="register-link">
-            <p>Don't have an account? <a href="{{ url_for('register') }}">Register here</a></p>
-        </div>
-    </div>
-</body>
-</html>''')
-
-# Register HTML
-with open('templates/register.html', 'w', encoding='utf-8') as f:
-    f.write('''<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Register - BTC Trading</title>
-    <style>
-        body {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        }
-        
-        .register-container {
-            background: white;
-            padding: 40px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            width: 100%;
-            max-width: 400px;
-        }
-        
-        h1 {
-            text-align: center;
-            color: #333;
-            margin-bottom: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            font-size: 1em;
-        }
-        
-        button {
-            width: 100%;
-            padding: 12px;
-            background: #10b981;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            font-size: 1.1em;
-            font-weight: bold;
-            cursor: pointer;
-        }
-        
-        .error {
-            color: #ef4444;
-            text-align: center;
-            margin-bottom: 15px;
-        }
-        
-        .login-link {
-            text-align: center;
-            margin-top: 20px;
-        }
-    </style>
-</head>
-<body>
-    <div class="register-container">
-        <h1>🎯 Create Account</h1>
-        
-        {% if error %}
-        <div class="error">{{ error }}</div>
-        {% endif %}
-        
-        <form method="POST">
-            <div class="form-group">
-                <input type="text" name="username" placeholder="Username" required>
-            </div>
-            <div class="form-group">
-                <input type="password" name="password" placeholder="Password" required>
-            </div>
-            <button type="submit">Register</button>
-        </form>
-        
-        <div class="login-link">
-            <p>Already have an account? <a href="{{ url_for('login') }}">Login here</a></p>
-        </div>
-    </div>
-</body>
-</html>''')
-
-# Add logout route
-@app.route('/logout')
-def logout():
-    session.pop('user_id', None)
-    return redirect(url_for('login'))
-
-print("✅ BTC Trading Platform created successfully!")
-print("🚀 Run the application: python app.py")
-print("🌐 Open: http://localhost:5000")
-print("📋 Features:")
-print("   - Real-time BTC price from Binance")
-print("   - Long/Short trading with leverage")
-print("   - PVP trading system")
-print("   - Deposit system")
-print("   - Live P&L calculation")
-print("   - Modern responsive design")
\ No newline at end of file
+    app.run(debug=True, port=5000)
\ No newline at end of file